@@ -7,6 +7,8 @@ Same (seed, prompt_index) → same prompt, always, everywhere.
 Zero files. Zero storage. Infinite prompts.
 """
 
+import os
+import string
 import struct
 
 try:
@@ -16,6 +18,21 @@ except ImportError:
         "DJZ-ZeroPrompt requires xxhash. Install with: pip install xxhash"
     )
 
+try:
+    import numpy as np
+except ImportError:
+    # Optional: only used to vectorize generate_prompts_batch
+    np = None
+
+# Backend for generate_prompt: "python" (default) or "numba" (opt-in JIT).
+# Select with the DJZ_ZEROPROMPT_IMPL environment variable before import.
+_IMPL = os.environ.get("DJZ_ZEROPROMPT_IMPL", "python").strip().lower()
+if _IMPL == "numba":
+    try:
+        from numba import njit
+    except ImportError:
+        _IMPL = "python"
+
 
 # =============================================================================
 # VOCABULARY POOLS - Semantic Building Blocks
@@ -216,19 +233,76 @@ TEMPLATES = [
     "{subject}, {environment}, {style}, {lighting}, {mood} atmosphere, {details}",
 ]
 
+# Precomputed at import so generate_prompt never walks the dict or calls len()
+_POOL_ITEMS = tuple((key, tuple(pool), len(pool)) for key, pool in POOLS.items())
+_N_TEMPLATES = len(TEMPLATES)
+
+
+def compile_template(template: str) -> tuple:
+    """
+    Pre-tokenize a template into literal strings and pool-index slots,
+    indexed by position in POOLS, so rendering skips str.format.
+    """
+    slot_of = {key: i for i, key in enumerate(POOLS)}
+    segments = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            segments.append(literal)
+        if field is not None:
+            segments.append(slot_of[field])
+    return tuple(segments)
+
+
+def build_renderer(segments: tuple, n_slots: int):
+    """
+    Generate a specialized renderer for one compiled template.
+    
+    Literal text is embedded through repr() with braces doubled, so the
+    renderer body is a single f-string. It takes one positional argument
+    per pool, in POOLS order.
+    """
+    body = "".join([
+        seg.replace("{", "{{").replace("}", "}}") if isinstance(seg, str)
+        else f"{{s{seg}}}"
+        for seg in segments
+    ])
+    params = ", ".join(f"s{i}" for i in range(n_slots))
+    source = f"def _render({params}):\n    return f{body!r}\n"
+    namespace = {}
+    exec(compile(source, "<zeroprompt template>", "exec"), namespace)
+    return namespace["_render"]
+
+
+_TEMPLATES_COMPILED = tuple(compile_template(t) for t in TEMPLATES)
+_TEMPLATE_RENDERERS = tuple(
+    build_renderer(segments, len(POOLS)) for segments in _TEMPLATES_COMPILED
+)
+
 
 # =============================================================================
 # CORE HASH FUNCTIONS - O(1) Position-Based Generation
 # =============================================================================
 
+# Precompiled packers indexed by coordinate count
+_PACKERS = tuple(struct.Struct('<' + 'i' * n).pack for n in range(9))
+_PACK2 = _PACKERS[2]
+# generate_prompt packs prompt_idx unsigned after masking to 32 bits, so the
+# node's full 0..0xFFFFFFFF range hashes instead of overflowing '<i'. Bytes
+# are unchanged for 0..2**31-1 and match the batch/Numba paths everywhere.
+_PACK_POS = struct.Struct('<Ii').pack
+
+
 def prompt_hash(seed: int, *coords: int) -> int:
     """
     Pure O(1) hash from seed + arbitrary coordinate tuple.
     Uses xxhash32 for speed and cross-platform determinism.
+    One-shot xxh32_intdigest avoids building a hasher object per call.
     """
-    h = xxhash.xxh32(seed=seed & 0xFFFFFFFF)
-    h.update(struct.pack('<' + 'i' * len(coords), *coords))
-    return h.intdigest()
+    if len(coords) < len(_PACKERS):
+        data = _PACKERS[len(coords)](*coords)
+    else:
+        data = struct.pack(f'<{len(coords)}i', *coords)
+    return xxhash.xxh32_intdigest(data, seed=seed & 0xFFFFFFFF)
 
 
 def hash_to_index(h: int, pool_size: int) -> int:
@@ -236,32 +310,143 @@ def hash_to_index(h: int, pool_size: int) -> int:
     return h % pool_size
 
 
+# xxh32 primes (see xxhash spec)
+_XXH_PRIME2 = 0x85EBCA77
+_XXH_PRIME3 = 0xC2B2AE3D
+_XXH_PRIME4 = 0x27D4EB2F
+_XXH_PRIME5 = 0x165667B1
+
+
+def prompt_hash_batch(seed: int, prompt_idx, coord):
+    """
+    Vectorized prompt_hash for two-coordinate positions.
+    Implements xxh32 over the packed 8-byte (prompt_idx, coord) buffer on
+    uint32 arrays, bit-identical to prompt_hash. Arguments broadcast.
+    """
+    lanes = (
+        (np.asarray(prompt_idx, dtype=np.int64) & 0xFFFFFFFF).astype(np.uint32),
+        (np.asarray(coord, dtype=np.int64) & 0xFFFFFFFF).astype(np.uint32),
+    )
+    shape = np.broadcast_shapes(lanes[0].shape, lanes[1].shape)
+    acc = np.full(shape, ((seed & 0xFFFFFFFF) + _XXH_PRIME5 + 8) & 0xFFFFFFFF, dtype=np.uint32)
+    for lane in lanes:
+        acc += lane * np.uint32(_XXH_PRIME3)
+        acc = (acc << np.uint32(17)) | (acc >> np.uint32(15))
+        acc *= np.uint32(_XXH_PRIME4)
+    # Avalanche
+    acc ^= acc >> np.uint32(15)
+    acc *= np.uint32(_XXH_PRIME2)
+    acc ^= acc >> np.uint32(13)
+    acc *= np.uint32(_XXH_PRIME3)
+    acc ^= acc >> np.uint32(16)
+    return acc
+
+
 # =============================================================================
 # PROMPT GENERATION
 # =============================================================================
 
-def generate_prompt(seed: int, prompt_idx: int) -> str:
+def generate_prompt(seed: int, prompt_idx: int, *,
+                    _pack=_PACK_POS, _xxh=xxhash.xxh32_intdigest,
+                    _pool_items=_POOL_ITEMS, _renderers=_TEMPLATE_RENDERERS,
+                    _n_templates=_N_TEMPLATES) -> str:
     """
     O(1) prompt generation from seed and index.
     
     Args:
         seed: World seed for consistent generation
-        prompt_idx: Position in infinite prompt space
+        prompt_idx: Position in infinite prompt space (taken modulo 2**32)
     
     Returns:
         Complete formatted prompt as a single line paragraph
+    
+    The keyword-only underscore arguments bind module globals as locals
+    for speed; callers should not pass them.
     """
+    seed &= 0xFFFFFFFF
+    prompt_idx &= 0xFFFFFFFF
+    
     # Select template using coordinate 0
-    template_hash = prompt_hash(seed, prompt_idx, 0)
-    template = TEMPLATES[hash_to_index(template_hash, len(TEMPLATES))]
+    renderer = _renderers[_xxh(_pack(prompt_idx, 0), seed=seed) % _n_templates]
     
     # Generate each component with unique coordinate
-    components = {}
-    for i, (key, pool) in enumerate(POOLS.items()):
-        component_hash = prompt_hash(seed, prompt_idx, i + 1)
-        components[key] = pool[hash_to_index(component_hash, len(pool))]
+    return renderer(*[
+        pool[_xxh(_pack(prompt_idx, coord), seed=seed) % n]
+        for coord, (_, pool, n) in enumerate(_pool_items, 1)
+    ])
+
+
+def generate_prompts_batch(seed: int, start_idx: int, count: int) -> list[str]:
+    """
+    Generate `count` consecutive prompts starting at `start_idx`.
+    
+    Identical to calling generate_prompt for each index, but all
+    template/pool hashes are computed in one vectorized pass when NumPy
+    is available. Like generate_prompt (and the Numba backend), indices
+    are taken modulo 2**32, so the node's full index range is valid.
     
-    return template.format(**components)
+    Returns:
+        List of prompts for indices start_idx .. start_idx + count - 1
+    """
+    if np is None:
+        return [generate_prompt(seed, idx) for idx in range(start_idx, start_idx + count)]
+    
+    indices = np.arange(start_idx, start_idx + count, dtype=np.int64)
+    coords = np.arange(len(_POOL_ITEMS) + 1, dtype=np.int64)
+    sizes = np.array([_N_TEMPLATES] + [n for _, _, n in _POOL_ITEMS], dtype=np.uint32)
+    
+    # (count, 1 + n_pools) matrix: column 0 = template, then one per pool
+    picks = (prompt_hash_batch(seed, indices[:, None], coords[None, :]) % sizes).tolist()
+    
+    pools = [pool for _, pool, _ in _POOL_ITEMS]
+    prompts = []
+    for row in picks:
+        prompts.append(_TEMPLATE_RENDERERS[row[0]](
+            *[pool[i] for pool, i in zip(pools, row[1:])]
+        ))
+    return prompts
+
+
+# =============================================================================
+# OPTIONAL NUMBA BACKEND
+# =============================================================================
+
+if _IMPL == "numba":
+    @njit(cache=True)
+    def _xxh32_pair(seed, a, b):
+        """xxh32 of the packed 8-byte (a, b) buffer, same as prompt_hash."""
+        mask = 0xFFFFFFFF
+        acc = (seed + 0x165667B1 + 8) & mask
+        for lane in (a & mask, b & mask):
+            acc = (acc + lane * 0xC2B2AE3D) & mask
+            acc = ((acc << 17) | (acc >> 15)) & mask
+            acc = (acc * 0x27D4EB2F) & mask
+        acc ^= acc >> 15
+        acc = (acc * 0x85EBCA77) & mask
+        acc ^= acc >> 13
+        acc = (acc * 0xC2B2AE3D) & mask
+        acc ^= acc >> 16
+        return acc
+
+    @njit(cache=True)
+    def _pick_indices(seed, prompt_idx, sizes):
+        """Template index followed by one index per pool."""
+        picks = np.empty(sizes.shape[0], dtype=np.int64)
+        for coord in range(sizes.shape[0]):
+            picks[coord] = _xxh32_pair(seed & 0xFFFFFFFF, prompt_idx, coord) % sizes[coord]
+        return picks
+
+    _INDEX_SIZES = np.array([_N_TEMPLATES] + [n for _, _, n in _POOL_ITEMS], dtype=np.int64)
+    _POOLS_TUPLE = tuple(pool for _, pool, _ in _POOL_ITEMS)
+
+    def _generate_prompt_numba(seed: int, prompt_idx: int) -> str:
+        """O(1) prompt generation from seed and index (Numba backend)."""
+        picks = _pick_indices(seed, prompt_idx, _INDEX_SIZES).tolist()
+        return _TEMPLATE_RENDERERS[picks[0]](
+            *[pool[i] for pool, i in zip(_POOLS_TUPLE, picks[1:])]
+        )
+
+    generate_prompt = _generate_prompt_numba
 
 
 # =============================================================================
@@ -327,15 +512,17 @@ class DJZZeroPromptV1:
         prompt = generate_prompt(seed, prompt_index)
         
         # Apply prefix/suffix if provided
-        if prefix or suffix:
-            prompt = f"{prefix}{prompt}{suffix}"
+        if prefix:
+            prompt = prefix + prompt
+        if suffix:
+            prompt = prompt + suffix
         
         return (prompt,)
     
     @classmethod
     def IS_CHANGED(cls, seed: int, prompt_index: int, prefix: str = "", suffix: str = ""):
         """Ensure node updates when inputs change."""
-        return prompt_hash(seed, prompt_index, 0)
+        return (seed, prompt_index, prefix, suffix)
 
 
 # =============================================================================
@@ -378,6 +565,13 @@ if __name__ == "__main__":
         match = "✓ MATCH" if p1 == p2 else "✗ MISMATCH"
         print(f"seed={seed}, idx={idx}: {match}")
     
+    # Test batch generation
+    print("\n[Test 3] Batch generation matches single-prompt generation:")
+    print("-" * 70)
+    batch = generate_prompts_batch(seed=42, start_idx=0, count=1000)
+    single = [generate_prompt(seed=42, prompt_idx=idx) for idx in range(1000)]
+    print(f"seed=42, idx=0..999: {'✓ MATCH' if batch == single else '✗ MISMATCH'}")
+    
     # Pool statistics
     print("\n[Statistics]")
     print("-" * 70)
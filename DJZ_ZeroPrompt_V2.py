@@ -12,10 +12,16 @@ V2 Features:
 - Backward compatible with V1 generation algorithm
 """
 
+import codecs
+import functools
 import json
 import os
+import re
+import string
 import struct
+import sys
 from pathlib import Path
+from typing import Optional
 
 try:
     import xxhash
@@ -24,29 +30,80 @@ except ImportError:
         "DJZ-ZeroPrompt requires xxhash. Install with: pip install xxhash"
     )
 
+try:
+    import numpy as np
+except ImportError:
+    # Optional: only used to vectorize generate_prompts_batch
+    np = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    # Optional: stdlib json is slower on large vocabulary profiles,
+    # but also decodes UTF-8 bytes directly
+    _loads = json.loads
+
+# Backend for generate_prompt: "python" (default) or "numba" (opt-in JIT).
+# Select with the DJZ_ZEROPROMPT_IMPL environment variable before import.
+_IMPL = os.environ.get("DJZ_ZEROPROMPT_IMPL", "python").strip().lower()
+if _IMPL == "numba":
+    try:
+        from numba import njit
+    except ImportError:
+        _IMPL = "python"
+
 
 # =============================================================================
 # PROFILE MANAGEMENT
 # =============================================================================
 
+_PROFILES_DIR = Path(__file__).resolve().parent / "profiles"
+try:
+    _PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+except OSError:
+    # Read-only install: use whatever profiles shipped with the package
+    pass
+
+
 def get_profiles_dir() -> Path:
     """Get the profiles directory path."""
-    return Path(__file__).parent / "profiles"
+    return _PROFILES_DIR
+
+
+# discover_profiles() result, valid while the directory mtime is unchanged
+_PROFILES_LIST_CACHE: tuple = ()
+_PROFILES_LIST_MTIME: int = -1
 
 
 def discover_profiles() -> list[str]:
     """
     Discover all available JSON profiles.
     Returns list of profile filenames (without path).
+    
+    The scan is cached and only repeated when the profiles directory's
+    mtime changes, i.e. when a file is added, removed or renamed.
     """
-    profiles_dir = get_profiles_dir()
+    global _PROFILES_LIST_CACHE, _PROFILES_LIST_MTIME
     
-    if not profiles_dir.exists():
-        profiles_dir.mkdir(parents=True, exist_ok=True)
-        return ["default.json"]
+    try:
+        mtime_ns = _PROFILES_DIR.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    if mtime_ns == _PROFILES_LIST_MTIME:
+        return list(_PROFILES_LIST_CACHE)
     
+    profiles = _scan_profiles()
+    _PROFILES_LIST_CACHE = tuple(profiles)
+    _PROFILES_LIST_MTIME = mtime_ns
+    return profiles
+
+
+def _scan_profiles() -> list[str]:
+    """List profile filenames on disk, default.json first."""
+    # The directory is created at import; a missing one simply globs empty
     profiles = sorted([
-        f.name for f in profiles_dir.glob("*.json")
+        f.name for f in _PROFILES_DIR.glob("*.json")
         if f.is_file()
     ])
     
@@ -55,6 +112,7 @@ def discover_profiles() -> list[str]:
         profiles.remove("default.json")
         profiles.insert(0, "default.json")
     
+    # ComfyUI needs at least one dropdown entry
     return profiles if profiles else ["default.json"]
 
 
@@ -63,14 +121,17 @@ def load_profile(profile_name: str) -> dict:
     Load a profile from JSON file.
     Returns profile dict with 'templates' and 'pools'.
     """
-    profiles_dir = get_profiles_dir()
-    profile_path = profiles_dir / profile_name
+    profile_path = _PROFILES_DIR / profile_name
     
-    if not profile_path.exists():
+    try:
+        data = profile_path.read_bytes()
+    except (FileNotFoundError, IsADirectoryError):
         raise FileNotFoundError(f"Profile not found: {profile_name}")
     
-    with open(profile_path, 'r', encoding='utf-8') as f:
-        profile = json.load(f)
+    # Editors such as Notepad may save a UTF-8 BOM, which neither parser accepts
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    profile = _loads(data)
     
     # Validate required fields
     if 'templates' not in profile:
@@ -78,9 +139,68 @@ def load_profile(profile_name: str) -> dict:
     if 'pools' not in profile:
         raise ValueError(f"Profile {profile_name} missing 'pools' field")
     
+    # Tuples for indexing; interning shares entries repeated across pools
+    # and across cached profiles. prepare_profile() reuses these tuples
+    # rather than copying them.
+    profile['templates'] = tuple(sys.intern(t) for t in profile['templates'])
+    profile['pools'] = {
+        key: tuple(sys.intern(str(entry)) for entry in pool)
+        for key, pool in profile['pools'].items()
+    }
+    
+    return prepare_profile(profile)
+
+
+def prepare_profile(profile: dict) -> dict:
+    """
+    Cache lookup structures on a profile dict so generate_prompt never
+    rebuilds them. Stored under underscore keys next to the raw data.
+    """
+    pools = profile['pools']
+    profile['_pool_items'] = tuple(
+        (key, tuple(pool), len(pool)) for key, pool in pools.items()
+    )
+    profile['_templates'] = tuple(profile['templates'])
+    profile['_n_templates'] = len(profile['templates'])
+    profile['_segments'] = tuple(
+        compile_template(template, pools) for template in profile['templates']
+    )
+    profile['_renderers'] = tuple(
+        None if segments is None else build_renderer(segments, len(pools))
+        for segments in profile['_segments']
+    )
+    if np is not None:
+        # Array views for vectorized paths: template + pool sizes for the
+        # modulo, and object arrays so a batch gathers each pool in one call
+        profile['_index_sizes'] = np.array(
+            [profile['_n_templates']] + [n for _, _, n in profile['_pool_items']],
+            dtype=np.int64,
+        )
+        profile['_pools_np'] = tuple(
+            np.array(pool, dtype=object) for _, pool, _ in profile['_pool_items']
+        )
     return profile
 
 
+@functools.lru_cache(maxsize=32)
+def _load_profile_cached(profile_name: str, mtime_ns: int) -> dict:
+    """Memoized load_profile; mtime_ns is part of the key so edits reload."""
+    return load_profile(profile_name)
+
+
+def get_profile(profile_name: str) -> dict:
+    """
+    Load a prepared profile through a bounded cache.
+    Costs one stat per call; edits on disk are picked up without a restart.
+    """
+    profile_path = _PROFILES_DIR / profile_name
+    try:
+        mtime_ns = profile_path.stat().st_mtime_ns
+    except OSError:
+        raise FileNotFoundError(f"Profile not found: {profile_name}")
+    return _load_profile_cached(profile_name, mtime_ns)
+
+
 def calculate_combinations(profile: dict) -> int:
     """Calculate total unique prompt combinations for a profile."""
     total = len(profile.get('templates', []))
@@ -93,14 +213,26 @@ def calculate_combinations(profile: dict) -> int:
 # CORE HASH FUNCTIONS - O(1) Position-Based Generation
 # =============================================================================
 
+# Precompiled packers indexed by coordinate count
+_PACKERS = tuple(struct.Struct('<' + 'i' * n).pack for n in range(9))
+_PACK2 = _PACKERS[2]
+# generate_prompt packs prompt_idx unsigned after masking to 32 bits, so the
+# node's full 0..0xFFFFFFFF range hashes instead of overflowing '<i'. Bytes
+# are unchanged for 0..2**31-1 and match the batch/Numba paths everywhere.
+_PACK_POS = struct.Struct('<Ii').pack
+
+
 def prompt_hash(seed: int, *coords: int) -> int:
     """
     Pure O(1) hash from seed + arbitrary coordinate tuple.
     Uses xxhash32 for speed and cross-platform determinism.
+    One-shot xxh32_intdigest avoids building a hasher object per call.
     """
-    h = xxhash.xxh32(seed=seed & 0xFFFFFFFF)
-    h.update(struct.pack('<' + 'i' * len(coords), *coords))
-    return h.intdigest()
+    if len(coords) < len(_PACKERS):
+        data = _PACKERS[len(coords)](*coords)
+    else:
+        data = struct.pack(f'<{len(coords)}i', *coords)
+    return xxhash.xxh32_intdigest(data, seed=seed & 0xFFFFFFFF)
 
 
 def hash_to_index(h: int, pool_size: int) -> int:
@@ -108,44 +240,257 @@ def hash_to_index(h: int, pool_size: int) -> int:
     return h % pool_size
 
 
+# xxh32 primes (see xxhash spec)
+_XXH_PRIME2 = 0x85EBCA77
+_XXH_PRIME3 = 0xC2B2AE3D
+_XXH_PRIME4 = 0x27D4EB2F
+_XXH_PRIME5 = 0x165667B1
+
+
+def prompt_hash_batch(seed: int, prompt_idx, coord):
+    """
+    Vectorized prompt_hash for two-coordinate positions.
+    Implements xxh32 over the packed 8-byte (prompt_idx, coord) buffer on
+    uint32 arrays, bit-identical to prompt_hash. Arguments broadcast.
+    """
+    lanes = (
+        (np.asarray(prompt_idx, dtype=np.int64) & 0xFFFFFFFF).astype(np.uint32),
+        (np.asarray(coord, dtype=np.int64) & 0xFFFFFFFF).astype(np.uint32),
+    )
+    shape = np.broadcast_shapes(lanes[0].shape, lanes[1].shape)
+    acc = np.full(shape, ((seed & 0xFFFFFFFF) + _XXH_PRIME5 + 8) & 0xFFFFFFFF, dtype=np.uint32)
+    for lane in lanes:
+        acc += lane * np.uint32(_XXH_PRIME3)
+        acc = (acc << np.uint32(17)) | (acc >> np.uint32(15))
+        acc *= np.uint32(_XXH_PRIME4)
+    # Avalanche
+    acc ^= acc >> np.uint32(15)
+    acc *= np.uint32(_XXH_PRIME2)
+    acc ^= acc >> np.uint32(13)
+    acc *= np.uint32(_XXH_PRIME3)
+    acc ^= acc >> np.uint32(16)
+    return acc
+
+
+# =============================================================================
+# TEMPLATE COMPILATION
+# =============================================================================
+
+_FORMATTER = string.Formatter()
+
+
+def compile_template(template: str, pools: dict) -> Optional[tuple]:
+    """
+    Pre-tokenize a template into literal strings and pool-index slots.
+    
+    Templates referencing unknown keys compile to the same partial output
+    the str.format fallback produced. Returns None for syntax the segment
+    renderer does not model (format specs, positional fields, bad braces);
+    those templates keep going through str.format.
+    """
+    slot_of = {key: i for i, key in enumerate(pools)}
+    try:
+        fields = list(_FORMATTER.parse(template))
+    except ValueError:
+        return None
+    
+    known = True
+    for _, field, spec, conversion in fields:
+        if field is None:
+            continue
+        if spec or conversion or not field.isidentifier():
+            return None
+        if field not in slot_of:
+            known = False
+    
+    segments = []
+    if known:
+        for literal, field, _, _ in fields:
+            if literal:
+                segments.append(literal)
+            if field is not None:
+                segments.append(slot_of[field])
+        return tuple(segments)
+    
+    # Unknown keys: only {known_key} is substituted, everything else is literal
+    if not slot_of:
+        return (template,)
+    pattern = re.compile("|".join(re.escape(f"{{{key}}}") for key in slot_of))
+    pos = 0
+    for match in pattern.finditer(template):
+        if match.start() > pos:
+            segments.append(template[pos:match.start()])
+        segments.append(slot_of[match.group()[1:-1]])
+        pos = match.end()
+    if pos < len(template):
+        segments.append(template[pos:])
+    return tuple(segments)
+
+
+def build_renderer(segments: tuple, n_slots: int):
+    """
+    Generate a specialized renderer for one compiled template.
+    
+    Literal text is embedded through repr() with braces doubled, so the
+    renderer body is a single f-string. It takes one positional argument
+    per pool, in pool order.
+    """
+    body = "".join([
+        seg.replace("{", "{{").replace("}", "}}") if isinstance(seg, str)
+        else f"{{s{seg}}}"
+        for seg in segments
+    ])
+    params = ", ".join(f"s{i}" for i in range(n_slots))
+    source = f"def _render({params}):\n    return f{body!r}\n"
+    namespace = {}
+    exec(compile(source, "<zeroprompt template>", "exec"), namespace)
+    return namespace["_render"]
+
+
+def render_template(profile: dict, template_idx: int, selections: list) -> str:
+    """Render a prepared profile's template with one selection per pool."""
+    renderer = profile['_renderers'][template_idx]
+    if renderer is not None:
+        return renderer(*selections)
+    
+    # Format template with available components
+    # Use safe formatting to handle missing keys gracefully
+    template = profile['_templates'][template_idx]
+    components = {
+        key: selection
+        for (key, _, _), selection in zip(profile['_pool_items'], selections)
+    }
+    try:
+        return template.format(**components)
+    except KeyError as e:
+        # If template references a key not in pools, return partial
+        for key in profile['pools'].keys():
+            template = template.replace(f"{{{key}}}", components.get(key, f"[{key}]"))
+        return template
+
+
 # =============================================================================
 # PROMPT GENERATION
 # =============================================================================
 
-def generate_prompt(seed: int, prompt_idx: int, profile: dict) -> str:
+def generate_prompt(seed: int, prompt_idx: int, profile: dict, *,
+                    _pack=_PACK_POS, _xxh=xxhash.xxh32_intdigest) -> str:
     """
     O(1) prompt generation from seed, index, and profile.
     
     Args:
         seed: World seed for consistent generation
-        prompt_idx: Position in infinite prompt space
+        prompt_idx: Position in infinite prompt space (taken modulo 2**32)
         profile: Loaded profile dict with 'templates' and 'pools'
     
     Returns:
         Complete formatted prompt as a single line paragraph
+    
+    The keyword-only underscore arguments bind module globals as locals
+    for speed; callers should not pass them.
     """
-    templates = profile['templates']
-    pools = profile['pools']
+    if '_pool_items' not in profile:
+        prepare_profile(profile)
+    
+    seed &= 0xFFFFFFFF
+    prompt_idx &= 0xFFFFFFFF
     
     # Select template using coordinate 0
-    template_hash = prompt_hash(seed, prompt_idx, 0)
-    template = templates[hash_to_index(template_hash, len(templates))]
+    template_idx = _xxh(_pack(prompt_idx, 0), seed=seed) % profile['_n_templates']
     
     # Generate each component with unique coordinate
-    components = {}
-    for i, (key, pool) in enumerate(pools.items()):
-        component_hash = prompt_hash(seed, prompt_idx, i + 1)
-        components[key] = pool[hash_to_index(component_hash, len(pool))]
+    selections = [
+        pool[_xxh(_pack(prompt_idx, coord), seed=seed) % n]
+        for coord, (_, pool, n) in enumerate(profile['_pool_items'], 1)
+    ]
     
-    # Format template with available components
-    # Use safe formatting to handle missing keys gracefully
-    try:
-        return template.format(**components)
-    except KeyError as e:
-        # If template references a key not in pools, return partial
-        for key in pools.keys():
-            template = template.replace(f"{{{key}}}", components.get(key, f"[{key}]"))
-        return template
+    renderer = profile['_renderers'][template_idx]
+    if renderer is not None:
+        return renderer(*selections)
+    return render_template(profile, template_idx, selections)
+
+
+def generate_prompts_batch(seed: int, start_idx: int, count: int,
+                           profile: dict) -> list[str]:
+    """
+    Generate `count` consecutive prompts starting at `start_idx`.
+    
+    Identical to calling generate_prompt for each index, but all
+    template/pool hashes are computed in one vectorized pass when NumPy
+    is available. Like generate_prompt (and the Numba backend), indices
+    are taken modulo 2**32, so the node's full index range is valid.
+    
+    Returns:
+        List of prompts for indices start_idx .. start_idx + count - 1
+    """
+    if np is None:
+        return [
+            generate_prompt(seed, idx, profile)
+            for idx in range(start_idx, start_idx + count)
+        ]
+    
+    if '_index_sizes' not in profile:
+        prepare_profile(profile)
+    sizes = profile['_index_sizes']
+    
+    indices = np.arange(start_idx, start_idx + count, dtype=np.int64)
+    coords = np.arange(len(sizes), dtype=np.int64)
+    
+    # (count, 1 + n_pools) matrix: column 0 = template, then one per pool
+    picks = prompt_hash_batch(seed, indices[:, None], coords[None, :]) % sizes
+    
+    # One fancy-indexing gather per pool selects that component for every prompt
+    columns = [
+        pool_arr[picks[:, i + 1]].tolist()
+        for i, pool_arr in enumerate(profile['_pools_np'])
+    ]
+    rows = zip(*columns) if columns else [()] * count
+    return [
+        render_template(profile, template_idx, selections)
+        for template_idx, selections in zip(picks[:, 0].tolist(), rows)
+    ]
+
+
+# =============================================================================
+# OPTIONAL NUMBA BACKEND
+# =============================================================================
+
+if _IMPL == "numba":
+    @njit(cache=True)
+    def _xxh32_pair(seed, a, b):
+        """xxh32 of the packed 8-byte (a, b) buffer, same as prompt_hash."""
+        mask = 0xFFFFFFFF
+        acc = (seed + 0x165667B1 + 8) & mask
+        for lane in (a & mask, b & mask):
+            acc = (acc + lane * 0xC2B2AE3D) & mask
+            acc = ((acc << 17) | (acc >> 15)) & mask
+            acc = (acc * 0x27D4EB2F) & mask
+        acc ^= acc >> 15
+        acc = (acc * 0x85EBCA77) & mask
+        acc ^= acc >> 13
+        acc = (acc * 0xC2B2AE3D) & mask
+        acc ^= acc >> 16
+        return acc
+
+    @njit(cache=True)
+    def _pick_indices(seed, prompt_idx, sizes):
+        """Template index followed by one index per pool."""
+        picks = np.empty(sizes.shape[0], dtype=np.int64)
+        for coord in range(sizes.shape[0]):
+            picks[coord] = _xxh32_pair(seed & 0xFFFFFFFF, prompt_idx, coord) % sizes[coord]
+        return picks
+
+    def _generate_prompt_numba(seed: int, prompt_idx: int, profile: dict) -> str:
+        """O(1) prompt generation from seed, index, and profile (Numba backend)."""
+        if '_index_sizes' not in profile:
+            prepare_profile(profile)
+        picks = _pick_indices(seed, prompt_idx, profile['_index_sizes']).tolist()
+        selections = [
+            pool[i] for (_, pool, _), i in zip(profile['_pool_items'], picks[1:])
+        ]
+        return render_template(profile, picks[0], selections)
+
+    generate_prompt = _generate_prompt_numba
 
 
 # =============================================================================
@@ -162,10 +507,6 @@ class DJZZeroPromptV2:
     V2 adds JSON profile support for customizable vocabulary pools.
     """
     
-    # Class-level cache for profiles
-    _profile_cache: dict = {}
-    _last_profile_scan: float = 0
-    
     @classmethod
     def INPUT_TYPES(cls):
         # Discover available profiles
@@ -219,32 +560,33 @@ class DJZZeroPromptV2:
         Returns:
             Tuple containing the generated prompt string
         """
-        # Load profile (with caching)
-        if profile not in self._profile_cache:
-            try:
-                self._profile_cache[profile] = load_profile(profile)
-            except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
-                # Return error message as prompt
-                return (f"[Error loading profile '{profile}': {str(e)}]",)
-        
-        profile_data = self._profile_cache[profile]
+        # Load profile (cached, reloaded when the file changes)
+        try:
+            profile_data = get_profile(profile)
+        except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
+            # Return error message as prompt
+            return (f"[Error loading profile '{profile}': {str(e)}]",)
         
         # Generate prompt
         prompt = generate_prompt(seed, prompt_index, profile_data)
         
         # Apply prefix/suffix if provided
-        if prefix or suffix:
-            prompt = f"{prefix}{prompt}{suffix}"
+        if prefix:
+            prompt = prefix + prompt
+        if suffix:
+            prompt = prompt + suffix
         
         return (prompt,)
     
     @classmethod
     def IS_CHANGED(cls, profile: str, seed: int, prompt_index: int,
                    prefix: str = "", suffix: str = ""):
-        """Ensure node updates when inputs change."""
-        # Include profile name hash for cache invalidation
-        profile_hash = xxhash.xxh32(profile.encode()).intdigest()
-        return prompt_hash(seed ^ profile_hash, prompt_index, 0)
+        """Ensure node updates when inputs or the profile file change."""
+        try:
+            mtime_ns = (_PROFILES_DIR / profile).stat().st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        return (profile, mtime_ns, seed, prompt_index, prefix, suffix)
 
 
 # =============================================================================
@@ -305,7 +647,7 @@ class DJZZeroPromptProfileInfo:
     @classmethod
     def IS_CHANGED(cls, profile: str):
         """Check if profile file has changed."""
-        profile_path = get_profiles_dir() / profile
+        profile_path = _PROFILES_DIR / profile
         if profile_path.exists():
             return profile_path.stat().st_mtime
         return 0
@@ -375,6 +717,10 @@ if __name__ == "__main__":
             p2 = generate_prompt(seed=42, prompt_idx=1000, profile=profile_data)
             print(f"  seed=42, idx=1000: {'✓ MATCH' if p1 == p2 else '✗ MISMATCH'}")
             
+            batch = generate_prompts_batch(seed=42, start_idx=0, count=100, profile=profile_data)
+            single = [generate_prompt(seed=42, prompt_idx=idx, profile=profile_data) for idx in range(100)]
+            print(f"  batch idx=0..99: {'✓ MATCH' if batch == single else '✗ MISMATCH'}")
+            
         except Exception as e:
             print(f"Error: {e}")
     
@@ -20,5 +20,5 @@ NODE_DISPLAY_NAME_MAPPINGS = {**V1_DISPLAY_MAPPINGS, **V2_DISPLAY_MAPPINGS}
 
 __all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS"]
 
-__version__ = "1.1.0"
+__version__ = "1.2.0"
 __author__ = "Drift Johnson"